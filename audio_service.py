@@ -0,0 +1,284 @@
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Default capture settings (mono, so the frames can go straight into speech_recognition)
+SAMPLE_RATE = 44100
+BLOCK_SIZE = 4410  # 100 ms per frame
+
+
+# Fair queue for the audio devices: every session gets a turn in round-robin
+# order, so a session queuing many turns cannot starve the others
+class FairTurnQueue:
+    def __init__(self):
+        self._waiting = OrderedDict()  # session_id -> deque of pending futures
+        self._busy = False
+        self._holder = None  # Session that has the current turn
+
+    async def acquire(self, session_id):
+        if not self._busy and not self._waiting:
+            self._busy = True
+            self._holder = session_id
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiting.setdefault(session_id, deque()).append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # The turn was granted just before we got cancelled
+            else:
+                self._discard(session_id, future)
+            raise
+
+    def release(self):
+        if self._holder in self._waiting:
+            self._waiting.move_to_end(self._holder)  # Others go first after its turn
+        while self._waiting:
+            session_id, futures = self._waiting.popitem(last=False)
+            future = futures.popleft()
+            if futures:
+                self._waiting[session_id] = futures  # Back of the line for its next turn
+            if not future.done():
+                future.set_result(None)
+                self._holder = session_id
+                return
+        self._busy = False
+        self._holder = None
+
+    def _discard(self, session_id, future):
+        futures = self._waiting.get(session_id)
+        if futures is None:
+            return
+        try:
+            futures.remove(future)
+        except ValueError:
+            pass
+        if not futures:
+            del self._waiting[session_id]
+
+
+# Backend that talks to the real microphone and speakers
+class SoundDeviceBackend:
+    def __init__(self, rate=150):
+        self.rate = rate
+        self._engine = None
+        # pyttsx3 is not thread-safe, so all speech runs on one worker thread
+        self._tts_thread = ThreadPoolExecutor(max_workers=1)
+
+    async def frames(self, duration, samplerate=SAMPLE_RATE, blocksize=BLOCK_SIZE):
+        import sounddevice as sd
+
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        statuses = []  # PortAudio warnings (overflows etc.) seen during this capture
+
+        def callback(indata, frame_count, time_info, status):
+            if status:
+                statuses.append(str(status))
+            loop.call_soon_threadsafe(queue.put_nowait, indata.copy())
+
+        # If the stream stalls, give up so the turn is released instead of
+        # blocking every session behind it
+        timeout = max(1.0, 5 * blocksize / samplerate)
+        remaining = int(duration * samplerate)
+        with sd.InputStream(samplerate=samplerate, channels=1, dtype=np.int16,
+                            blocksize=blocksize, callback=callback):
+            while remaining > 0:
+                try:
+                    frame = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    detail = f" ({', '.join(statuses)})" if statuses else ""
+                    raise RuntimeError(f"Microphone stopped delivering audio{detail}") from None
+                frame = frame[:remaining]
+                remaining -= len(frame)
+                yield frame
+
+    async def play(self, text):
+        await asyncio.get_running_loop().run_in_executor(self._tts_thread, self._speak, text)
+
+    def _speak(self, text):
+        import pyttsx3
+
+        if self._engine is None:
+            self._engine = pyttsx3.init()
+            self._engine.setProperty('rate', self.rate)
+        self._engine.say(text)
+        self._engine.runAndWait()
+        self._engine.stop()
+
+
+# Backend with no hardware: produces frames in real time and "speaks" for a
+# time proportional to the text length. Used for headless load tests.
+# Pass mono int16 samples to replay a fixture recording instead of silence.
+class SimulatedBackend:
+    def __init__(self, speed=1.0, seconds_per_char=0.01, samples=None):
+        self.speed = speed  # >1 runs faster than real time
+        self.seconds_per_char = seconds_per_char
+        self.samples = samples
+
+    async def frames(self, duration, samplerate=SAMPLE_RATE, blocksize=BLOCK_SIZE):
+        total = int(duration * samplerate)
+        position = 0
+        while position < total:
+            count = min(blocksize, total - position)
+            await asyncio.sleep(count / samplerate / self.speed)
+            frame = np.zeros((count, 1), dtype=np.int16)
+            if self.samples is not None:
+                chunk = self.samples[position:position + count]
+                frame[:len(chunk), 0] = chunk
+            position += count
+            yield frame
+
+    async def play(self, text):
+        await asyncio.sleep(len(text) * self.seconds_per_char / self.speed)
+
+
+# Owns the input and output devices and hands out capture/playback turns to sessions.
+# The devices are half-duplex: one queue covers both, so a prompt from one session
+# never plays into another session's recording.
+class AudioService:
+    def __init__(self, backend):
+        self.backend = backend
+        self.turns = FairTurnQueue()
+        self._loop = None
+        self._thread = None
+
+    # Stream frames for one capture turn. on_acquired() is called once the mic is
+    # ours (from the service loop). Close the iterator (e.g. with
+    # contextlib.aclosing) if you stop early, so the device is released.
+    async def capture(self, session_id, duration, samplerate=SAMPLE_RATE, on_acquired=None):
+        await self.turns.acquire(session_id)
+        try:
+            if on_acquired is not None:
+                on_acquired()
+            async for frame in self.backend.frames(duration, samplerate):
+                yield frame
+        finally:
+            self.turns.release()
+
+    # Capture a whole clip and return it as one int16 array
+    async def record(self, session_id, duration, samplerate=SAMPLE_RATE, on_acquired=None):
+        frames = [frame async for frame in self.capture(session_id, duration, samplerate, on_acquired)]
+        if not frames:
+            return np.zeros((0, 1), dtype=np.int16)
+        return np.concatenate(frames)
+
+    async def play(self, session_id, text):
+        await self.turns.acquire(session_id)
+        try:
+            await self.backend.play(text)
+        finally:
+            self.turns.release()
+
+    # Run the service on its own event loop thread so synchronous callers
+    # (e.g. Streamlit script threads) can share it
+    def start(self):
+        if self._thread is not None:
+            return self
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="audio-service", daemon=True)
+        self._thread.start()
+        return self
+
+    # Schedule a coroutine on the service loop and return a concurrent future
+    def submit(self, coro):
+        if self._loop is None:
+            self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run(self, coro):
+        return self.submit(coro).result()
+
+    # Step through an async generator from a synchronous caller, one item per
+    # round trip to the service loop, and always close it afterwards.
+    # waiting(pending) is called with the future for the first item before blocking on it.
+    def iterate(self, agen, waiting=None):
+        pending = None
+        try:
+            while True:
+                pending = self.submit(agen.__anext__())
+                if waiting is not None:
+                    waiting(pending)
+                    waiting = None
+                try:
+                    yield pending.result()
+                except StopAsyncIteration:
+                    return
+        finally:
+            # If the caller bailed out mid-step, cancel that step (which releases
+            # any device it holds) before closing the generator
+            if pending is not None and not pending.done():
+                pending.cancel()
+            self.run(self._aclose(agen))
+
+    @staticmethod
+    async def _aclose(agen):
+        # A cancelled step may still be unwinding; aclose() fails while it runs
+        while agen.ag_running:
+            await asyncio.sleep(0)
+        await agen.aclose()
+
+    def stop(self):
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+        self._thread = None
+
+
+# Simulate N sessions each running the converter's prompt/listen dialogue
+async def _simulated_session(service, session_id, turns, duration, prompt, waits):
+    for _ in range(turns):
+        await service.play(session_id, prompt)
+        requested = time.perf_counter()
+        first_frame = None
+        async for _frame in service.capture(session_id, duration):
+            if first_frame is None:
+                first_frame = time.perf_counter()
+        waits.append(first_frame - requested)  # Time until the mic is actually ours
+
+
+async def load_test(sessions, turns=3, duration=5.0, speed=50.0,
+                    prompt="Which unit do you want to convert from?"):
+    service = AudioService(SimulatedBackend(speed=speed))
+    waits = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _simulated_session(service, f"session-{i}", turns, duration, prompt, waits)
+        for i in range(sessions)
+    ))
+    elapsed = time.perf_counter() - start
+    waits.sort()
+    return {
+        "sessions": sessions,
+        "turns": sessions * turns,
+        "elapsed": elapsed,
+        "mean_turn_latency": statistics.mean(waits),
+        "p95_turn_latency": waits[round(0.95 * (len(waits) - 1))],
+        "max_turn_latency": waits[-1],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless load test for the shared audio service")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--duration", type=float, default=5.0, help="Capture window in seconds")
+    parser.add_argument("--speed", type=float, default=50.0, help="Simulated speed-up over real time")
+    args = parser.parse_args()
+
+    print(f"{'sessions':>8} {'turns':>6} {'elapsed s':>10} {'mean s':>8} {'p95 s':>8} {'max s':>8}")
+    for count in args.sessions:
+        stats = asyncio.run(load_test(count, args.turns, args.duration, args.speed))
+        print(f"{stats['sessions']:>8} {stats['turns']:>6} {stats['elapsed']:>10.3f} "
+              f"{stats['mean_turn_latency']:>8.3f} {stats['p95_turn_latency']:>8.3f} "
+              f"{stats['max_turn_latency']:>8.3f}")
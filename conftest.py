@@ -0,0 +1 @@
+# Lets pytest import the app modules (audio_service, converter, ...) from tests/
@@ -0,0 +1,292 @@
+# Unit mapping for normalization
+unit_mapping = {
+    "kilometre": "Kilometers",
+    "kilometer": "Kilometers",
+    "metre": "Meters",
+    "meter": "Meters",
+    "foot": "Feet",
+    "mile": "Miles",
+    "kg": "Kilograms",
+    "gram": "Grams",
+    "pound": "Pounds",
+    "ounce": "Ounces",
+    "celsius": "Celsius",
+    "fahrenheit": "Fahrenheit",
+    "kelvin": "Kelvin",
+    "hectare": "Hectares",
+    "acre": "Acres",
+    "liter": "Liters",
+    "litre": "Liters",
+    "milliliter": "Milliliters",
+    "gallon": "Gallons"
+}
+
+def normalize_unit(unit_name):
+    return unit_mapping.get(unit_name.lower(), unit_name.title())
+
+# Unit categories and the units in each
+unit_categories = {
+    "Length": ["Meters", "Kilometers", "Feet", "Miles"],
+    "Weight": ["Kilograms", "Grams", "Pounds", "Ounces"],
+    "Temperature": ["Celsius", "Fahrenheit", "Kelvin"],
+    "Area": ["Square Meters", "Hectares", "Acres"],
+    "Volume": ["Liters", "Milliliters", "Cubic Meters", "Gallons"]
+}
+
+# Function to parse a spoken category, returns None if it isn't one we support
+def parse_category(text):
+    category = text.title()
+    return category if category in unit_categories else None
+
+# Function to parse a spoken unit, returns None if it isn't one of units
+def parse_unit(text, units):
+    unit = normalize_unit(text)
+    return unit if unit in units else None
+
+# Number words, for recognizers that spell numbers out ("twenty five point five")
+number_words = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+    "thirteen": 13, "fourteen": 14, "fifteen": 15, "sixteen": 16, "seventeen": 17,
+    "eighteen": 18, "nineteen": 19, "twenty": 20, "thirty": 30, "forty": 40,
+    "fifty": 50, "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90
+}
+
+# Function to read number words under 100: "seven", "fifteen", "twenty five"
+def parse_tens(words):
+    if len(words) == 1 and words[0] in number_words:
+        return number_words[words[0]]
+    if len(words) == 2:
+        tens = number_words.get(words[0], 0)
+        units = number_words.get(words[1], 0)
+        if tens >= 20 and tens % 10 == 0 and 1 <= units <= 9:
+            return tens + units
+    return None
+
+# Function to read the multiplier in front of "hundred"/"thousand" ("a" counts as one)
+def parse_head(words, parse):
+    return 1 if words == ["a"] else parse(words)
+
+# Function to read "N hundred [and] rest" (or anything parse_tens reads), N up to 99
+def parse_hundreds(words):
+    if "hundred" not in words:
+        return parse_tens(words)
+    i = words.index("hundred")
+    head = parse_head(words[:i], parse_tens)
+    rest = words[i + 1:]
+    if rest[:1] == ["and"]:
+        rest = rest[1:]
+    tail = parse_tens(rest) if rest else 0
+    if head is None or not 1 <= head <= 99 or tail is None:
+        return None
+    return head * 100 + tail
+
+# Function to read a whole spoken number. Digits said one by one ("one two five")
+# are read as a multi-digit number; any other order of number words is rejected.
+def parse_number_words(words):
+    if len(words) > 1 and all(number_words.get(word, 10) <= 9 for word in words):
+        return int("".join(str(number_words[word]) for word in words))
+    if "thousand" not in words:
+        return parse_hundreds(words)
+    i = words.index("thousand")
+    head = parse_head(words[:i], parse_hundreds)
+    rest = words[i + 1:]
+    if rest[:1] == ["and"]:
+        rest = rest[1:]
+    tail = parse_hundreds(rest) if rest else 0
+    if head is None or head < 1 or tail is None:
+        return None
+    return head * 1000 + tail
+
+# Function to parse a spoken value, returns None if it isn't a number
+def parse_value(text):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        pass
+    if not text:
+        return None
+
+    words = text.lower().replace("-", " ").split()
+    if not words:
+        return None
+    decimals = ""
+    if "point" in words:
+        i = words.index("point")
+        words, digits = words[:i], words[i + 1:]
+        if not digits or any(number_words.get(word, 10) > 9 for word in digits):
+            return None
+        decimals = "".join(str(number_words[word]) for word in digits)
+
+    whole = parse_number_words(words) if words else 0  # "point five"
+    if whole is None:
+        return None
+    if decimals:
+        return float(f"{whole}.{decimals}")
+    return float(whole)
+
+# Function to convert a value between two units of the same category
+def convert(unit_category, from_unit, to_unit, value):
+    result = None  # Initialize result
+    # Conversion logic based on selected category
+    if unit_category == "Length":
+        # Conversion logic for length
+        if from_unit == "Meters":
+            if to_unit == "Kilometers":
+                result = value / 1000
+            elif to_unit == "Feet":
+                result = value * 3.28084
+            elif to_unit == "Miles":
+                result = value * 0.000621371
+            else:
+                result = value
+        elif from_unit == "Kilometers":
+            if to_unit == "Meters":
+                result = value * 1000
+            elif to_unit == "Feet":
+                result = value * 3280.84
+            elif to_unit == "Miles":
+                result = value * 0.621371
+            else:
+                result = value
+        elif from_unit == "Feet":
+            if to_unit == "Meters":
+                result = value / 3.28084
+            elif to_unit == "Kilometers":
+                result = value / 3280.84
+            elif to_unit == "Miles":
+                result = value * 0.000189394
+            else:
+                result = value
+        elif from_unit == "Miles":
+            if to_unit == "Meters":
+                result = value * 1609.34
+            elif to_unit == "Kilometers":
+                result = value * 1.60934
+            elif to_unit == "Feet":
+                result = value * 5280
+            else:
+                result = value
+    elif unit_category == "Weight":
+        # Conversion logic for weight
+        if from_unit == "Kilograms":
+            if to_unit == "Grams":
+                result = value * 1000
+            elif to_unit == "Pounds":
+                result = value * 2.20462
+            elif to_unit == "Ounces":
+                result = value * 35.274
+            else:
+                result = value
+        elif from_unit == "Grams":
+            if to_unit == "Kilograms":
+                result = value / 1000
+            elif to_unit == "Pounds":
+                result = value * 0.00220462
+            elif to_unit == "Ounces":
+                result = value * 0.035274
+            else:
+                result = value
+        elif from_unit == "Pounds":
+            if to_unit == "Kilograms":
+                result = value * 0.453592
+            elif to_unit == "Grams":
+                result = value * 453.592
+            elif to_unit == "Ounces":
+                result = value * 16
+            else:
+                result = value
+        elif from_unit == "Ounces":
+            if to_unit == "Kilograms":
+                result = value * 0.0283495
+            elif to_unit == "Grams":
+                result = value * 28.3495
+            elif to_unit == "Pounds":
+                result = value * 0.0625
+            else:
+                result = value
+    elif unit_category == "Temperature":
+        # Conversion logic for temperature
+        if from_unit == "Celsius":
+            if to_unit == "Fahrenheit":
+                result = (value * 9/5) + 32
+            elif to_unit == "Kelvin":
+                result = value + 273.15
+            else:
+                result = value
+        elif from_unit == "Fahrenheit":
+            if to_unit == "Celsius":
+                result = (value - 32) * 5/9
+            elif to_unit == "Kelvin":
+                result = (value - 32) * 5/9 + 273.15
+            else:
+                result = value
+        elif from_unit == "Kelvin":
+            if to_unit == "Celsius":
+                result = value - 273.15
+            elif to_unit == "Fahrenheit":
+                result = (value - 273.15) * 9/5 + 32
+            else:
+                result = value
+    elif unit_category == "Area":
+        # Conversion logic for area (example)
+        if from_unit == "Square Meters":
+            if to_unit == "Hectares":
+                result = value / 10000
+            elif to_unit == "Acres":
+                result = value * 0.000247105
+            else:
+                result = value
+        elif from_unit == "Hectares":
+            if to_unit == "Square Meters":
+                result = value * 10000
+            elif to_unit == "Acres":
+                result = value * 2.47105
+            else:
+                result = value
+        elif from_unit == "Acres":
+            if to_unit == "Square Meters":
+                result = value / 0.000247105
+            elif to_unit == "Hectares":
+                result = value / 2.47105
+            else:
+                result = value
+    elif unit_category == "Volume":
+        # Conversion logic for volume (example)
+        if from_unit == "Liters":
+            if to_unit == "Milliliters":
+                result = value * 1000
+            elif to_unit == "Cubic Meters":
+                result = value / 1000
+            elif to_unit == "Gallons":
+                result = value * 0.264172
+            else:
+                result = value
+        elif from_unit == "Milliliters":
+            if to_unit == "Liters":
+                result = value / 1000
+            elif to_unit == "Cubic Meters":
+                result = value / 1000000
+            elif to_unit == "Gallons":
+                result = value * 0.000264172
+            else:
+                result = value
+        elif from_unit == "Cubic Meters":
+            if to_unit == "Liters":
+                result = value * 1000
+            elif to_unit == "Milliliters":
+                result = value * 1000000
+            elif to_unit == "Gallons":
+                result = value * 264.172
+            else:
+                result = value
+        elif from_unit == "Gallons":
+            if to_unit == "Liters":
+                result = value / 0.264172
+            elif to_unit == "Milliliters":
+                result = value / 0.000264172
+            elif to_unit == "Cubic Meters":
+                result = value / 264.172
+            else:
+                result = value
+    return result
@@ -1,76 +1,104 @@
+import os
+import threading
 import streamlit as st
 import speech_recognition as sr
-import pyttsx3
-import sounddevice as sd
-import numpy as np
-from scipy.io.wavfile import write
-
-# Initialize text-to-speech engine globally
-engine = None
-
-# Function to initialize the pyttsx3 engine
-def init_engine():
-    global engine
-    if engine is None:
-        engine = pyttsx3.init()
-        engine.setProperty('rate', 150)  # Optional: Adjust speech rate
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from audio_service import AudioService, SoundDeviceBackend
+from converter import convert, parse_category, parse_unit, parse_value
+from streaming_recognition import StreamingRecognizer, load_model
+
+# One audio service per process: it owns the mic and speakers and takes
+# turns between browser sessions so they don't fight over the devices
+@st.cache_resource
+def get_audio_service():
+    return AudioService(SoundDeviceBackend(rate=150)).start()
+
+# Offline model for streaming recognition, loaded once per process.
+# Returns (recognizer, None), or (None, error) if vosk or the model is missing;
+# the failure is cached too, so restart the app after installing a model.
+@st.cache_resource
+def get_streaming_recognizer():
+    try:
+        return StreamingRecognizer(load_model(os.environ.get("VOSK_MODEL_PATH", "model")), 44100), None
+    except Exception as error:
+        return None, str(error)
+
+# Identify the current browser session for fair scheduling
+def get_session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "default"
 
 # Function to convert text to speech
 def speak(text):
-    init_engine()  # Ensure the engine is initialized
-    engine.say(text)
-    engine.runAndWait()
-    engine.stop()  # Stop the engine after speaking
+    service = get_audio_service()
+    service.run(service.play(get_session_id(), text))
+
+# Another session may be using the mic: only ask to speak once the turn is ours
+def wait_for_turn(pending, acquired, status):
+    if not acquired.wait(0.1):
+        status.write("Waiting for the microphone, another session is using it...")
+        while not acquired.wait(0.1) and not pending.done():
+            pass
+    if acquired.is_set():
+        status.write("Listening... Speak now!")
+    else:
+        status.empty()
 
-# Function to capture voice input using sounddevice
+# Function to capture voice input through the shared audio service
 def get_audio_input():
     fs = 44100  # Sample rate
     duration = 5  # Duration in seconds
-    st.write("Listening... Speak now!")
-    recording = sd.rec(int(duration * fs), samplerate=fs, channels=2, dtype=np.int16)
-    sd.wait()  # Wait until the recording is finished
-    write("output.wav", fs, recording)  # Save as WAV file
+    service = get_audio_service()
+    acquired = threading.Event()
+    pending = service.submit(service.record(get_session_id(), duration, fs, on_acquired=acquired.set))
+    wait_for_turn(pending, acquired, st.empty())
+    recording = pending.result()
 
-    # Use speech_recognition to process the saved audio file
+    # Hand the samples to speech_recognition directly (no shared WAV file between sessions)
     recognizer = sr.Recognizer()
-    with sr.AudioFile("output.wav") as source:
-        audio = recognizer.record(source)
-        try:
-            text = recognizer.recognize_google(audio)
-            st.write(f"You said: {text}")
-            return text
-        except sr.UnknownValueError:
-            st.write("Sorry, I could not understand the audio.")
-            return None
-        except sr.RequestError:
-            st.write("Sorry, there was an issue with the speech recognition service.")
-            return None
-
-# Unit mapping for normalization
-unit_mapping = {
-    "kilometre": "Kilometers",
-    "kilometer": "Kilometers",
-    "metre": "Meters",
-    "meter": "Meters",
-    "foot": "Feet",
-    "mile": "Miles",
-    "kg": "Kilograms",
-    "gram": "Grams",
-    "pound": "Pounds",
-    "ounce": "Ounces",
-    "celsius": "Celsius",
-    "fahrenheit": "Fahrenheit",
-    "kelvin": "Kelvin",
-    "hectare": "Hectares",
-    "acre": "Acres",
-    "liter": "Liters",
-    "litre": "Liters",
-    "milliliter": "Milliliters",
-    "gallon": "Gallons"
-}
-
-def normalize_unit(unit_name):
-    return unit_mapping.get(unit_name.lower(), unit_name.title())
+    audio = sr.AudioData(recording.tobytes(), fs, recording.dtype.itemsize)
+    try:
+        text = recognizer.recognize_google(audio)
+        st.write(f"You said: {text}")
+        return text
+    except sr.UnknownValueError:
+        st.write("Sorry, I could not understand the audio.")
+        return None
+    except sr.RequestError:
+        st.write("Sorry, there was an issue with the speech recognition service.")
+        return None
+
+# Function to capture voice input while recognizing it, showing partial results as they come.
+# interpret() runs speculatively on every hypothesis, so its answer for the final text is
+# usually ready the moment speech ends. Returns (text, interpreted).
+def get_streaming_input(interpret=None):
+    fs = 44100  # Sample rate
+    duration = 5  # Maximum duration in seconds, capture stops early at end of speech
+    recognizer, _ = get_streaming_recognizer()
+    service = get_audio_service()
+    acquired = threading.Event()
+    frames = service.capture(get_session_id(), duration, fs, on_acquired=acquired.set)
+    hypotheses = recognizer.hypotheses(frames, interpret)
+    status = st.empty()
+    partial = st.empty()
+    for hypothesis in service.iterate(hypotheses, waiting=lambda pending: wait_for_turn(pending, acquired, status)):
+        if not hypothesis.final:
+            partial.write(f"Hearing: {hypothesis.text}...")
+        elif hypothesis.text:
+            partial.empty()
+            st.write(f"You said: {hypothesis.text}")
+            return hypothesis.text, hypothesis.interpreted
+    partial.empty()
+    st.write("Sorry, I could not understand the audio.")
+    return None, None
+
+# Function to get voice input with whichever recognizer is enabled
+def listen(interpret=None):
+    if streaming_enabled:
+        return get_streaming_input(interpret)
+    text = get_audio_input()
+    return text, interpret(text) if interpret and text else None
 
 # Title of the app
 st.title("Smart & Quick Voice-Controlled Converter")
@@ -88,6 +116,12 @@ st.sidebar.write(
 
 # Sidebar for enabling voice
 voice_enabled = st.sidebar.checkbox("Enable Voice")
+streaming_enabled = voice_enabled and st.sidebar.checkbox("Streaming recognition (offline)")
+if streaming_enabled:
+    _, streaming_error = get_streaming_recognizer()
+    if streaming_error:
+        st.sidebar.warning(f"Streaming recognition is unavailable ({streaming_error}), using the standard recognizer.")
+        streaming_enabled = False
 
 # Sidebar for unit categories
 unit_category = st.sidebar.selectbox(
@@ -99,9 +133,9 @@ unit_category = st.sidebar.selectbox(
 if voice_enabled:
     speak("Which converter do you want to use?")
     st.write("Which converter do you want to use?")
-    voice_input = get_audio_input()
+    voice_input, spoken_category = listen(parse_category)
     if voice_input:
-        unit_category = voice_input.title()  # Normalize to match expected category names
+        unit_category = spoken_category or voice_input.title()  # Normalize to match expected category names
         speak(f"You selected {unit_category}.")
         st.write(f"You selected {unit_category}.")
 
@@ -128,30 +162,26 @@ if unit_category in ["Length", "Weight", "Temperature", "Area", "Volume"]:  # Va
     if voice_enabled:
         speak("Which unit do you want to convert from?")
         st.write("Which unit do you want to convert from?")
-        from_unit_voice = get_audio_input()
+        from_unit_voice, from_unit = listen(lambda text: parse_unit(text, units))
         if from_unit_voice:
-            from_unit = normalize_unit(from_unit_voice)  # Normalize the unit name
-            if from_unit in units:  # Check if the unit is valid
+            if from_unit is not None:  # Check if the unit is valid
                 speak(f"You selected {from_unit}.")
                 st.write(f"You selected {from_unit}.")
             else:
                 st.write("Invalid unit. Please try again.")
-                from_unit = None
         else:
             st.write("Voice input failed. Please select the unit manually.")
             from_unit = st.selectbox("From", units)
 
         speak("Which unit do you want to convert to?")
         st.write("Which unit do you want to convert to?")
-        to_unit_voice = get_audio_input()
+        to_unit_voice, to_unit = listen(lambda text: parse_unit(text, units))
         if to_unit_voice:
-            to_unit = normalize_unit(to_unit_voice)  # Normalize the unit name
-            if to_unit in units:  # Check if the unit is valid
+            if to_unit is not None:  # Check if the unit is valid
                 speak(f"You selected {to_unit}.")
                 st.write(f"You selected {to_unit}.")
             else:
                 st.write("Invalid unit. Please try again.")
-                to_unit = None
         else:
             st.write("Voice input failed. Please select the unit manually.")
             to_unit = st.selectbox("To", units)
@@ -159,14 +189,21 @@ if unit_category in ["Length", "Weight", "Temperature", "Area", "Volume"]:  # Va
         from_unit = st.selectbox("From", units)
         to_unit = st.selectbox("To", units)
 
+    result = None  # Initialize result
     if voice_enabled:
         speak("Please say the value you want to convert.")
         st.write("Please say the value you want to convert.")
-        value_voice = get_audio_input()
+        # Convert each hypothesis as it comes in, so the result is ready when speech ends
+        def interpret_value(text):
+            spoken_value = parse_value(text)
+            if spoken_value is None:
+                return None
+            return convert(unit_category, from_unit, to_unit, spoken_value)
+
+        value_voice, result = listen(interpret_value)
         if value_voice:
-            try:
-                value = float(value_voice)  # Convert the voice input to a float
-            except ValueError:
+            value = parse_value(value_voice)  # Convert the voice input to a float
+            if value is None:
                 st.write("Invalid value. Please enter a number.")
                 value = st.number_input("Enter value for conversion", value=1.0)  # Fallback to manual input
         else:
@@ -174,168 +211,8 @@ if unit_category in ["Length", "Weight", "Temperature", "Area", "Volume"]:  # Va
     else:
         value = st.number_input("Enter value for conversion", value=1.0)  # Manual input if voice is not enabled
 
-    result = None  # Initialize result
-    # Conversion logic based on selected category
-    if unit_category == "Length":
-        # Conversion logic for length
-        if from_unit == "Meters":
-            if to_unit == "Kilometers":
-                result = value / 1000
-            elif to_unit == "Feet":
-                result = value * 3.28084
-            elif to_unit == "Miles":
-                result = value * 0.000621371
-            else:
-                result = value
-        elif from_unit == "Kilometers":
-            if to_unit == "Meters":
-                result = value * 1000
-            elif to_unit == "Feet":
-                result = value * 3280.84
-            elif to_unit == "Miles":
-                result = value * 0.621371
-            else:
-                result = value
-        elif from_unit == "Feet":
-            if to_unit == "Meters":
-                result = value / 3.28084
-            elif to_unit == "Kilometers":
-                result = value / 3280.84
-            elif to_unit == "Miles":
-                result = value * 0.000189394
-            else:
-                result = value
-        elif from_unit == "Miles":
-            if to_unit == "Meters":
-                result = value * 1609.34
-            elif to_unit == "Kilometers":
-                result = value * 1.60934
-            elif to_unit == "Feet":
-                result = value * 5280
-            else:
-                result = value
-    elif unit_category == "Weight":
-        # Conversion logic for weight
-        if from_unit == "Kilograms":
-            if to_unit == "Grams":
-                result = value * 1000
-            elif to_unit == "Pounds":
-                result = value * 2.20462
-            elif to_unit == "Ounces":
-                result = value * 35.274
-            else:
-                result = value
-        elif from_unit == "Grams":
-            if to_unit == "Kilograms":
-                result = value / 1000
-            elif to_unit == "Pounds":
-                result = value * 0.00220462
-            elif to_unit == "Ounces":
-                result = value * 0.035274
-            else:
-                result = value
-        elif from_unit == "Pounds":
-            if to_unit == "Kilograms":
-                result = value * 0.453592
-            elif to_unit == "Grams":
-                result = value * 453.592
-            elif to_unit == "Ounces":
-                result = value * 16
-            else:
-                result = value
-        elif from_unit == "Ounces":
-            if to_unit == "Kilograms":
-                result = value * 0.0283495
-            elif to_unit == "Grams":
-                result = value * 28.3495
-            elif to_unit == "Pounds":
-                result = value * 0.0625
-            else:
-                result = value
-    elif unit_category == "Temperature":
-        # Conversion logic for temperature
-        if from_unit == "Celsius":
-            if to_unit == "Fahrenheit":
-                result = (value * 9/5) + 32
-            elif to_unit == "Kelvin":
-                result = value + 273.15
-            else:
-                result = value
-        elif from_unit == "Fahrenheit":
-            if to_unit == "Celsius":
-                result = (value - 32) * 5/9
-            elif to_unit == "Kelvin":
-                result = (value - 32) * 5/9 + 273.15
-            else:
-                result = value
-        elif from_unit == "Kelvin":
-            if to_unit == "Celsius":
-                result = value - 273.15
-            elif to_unit == "Fahrenheit":
-                result = (value - 273.15) * 9/5 + 32
-            else:
-                result = value
-    elif unit_category == "Area":
-        # Conversion logic for area (example)
-        if from_unit == "Square Meters":
-            if to_unit == "Hectares":
-                result = value / 10000
-            elif to_unit == "Acres":
-                result = value * 0.000247105
-            else:
-                result = value
-        elif from_unit == "Hectares":
-            if to_unit == "Square Meters":
-                result = value * 10000
-            elif to_unit == "Acres":
-                result = value * 2.47105
-            else:
-                result = value
-        elif from_unit == "Acres":
-            if to_unit == "Square Meters":
-                result = value / 0.000247105
-            elif to_unit == "Hectares":
-                result = value / 2.47105
-            else:
-                result = value
-    elif unit_category == "Volume":
-        # Conversion logic for volume (example)
-        if from_unit == "Liters":
-            if to_unit == "Milliliters":
-                result = value * 1000
-            elif to_unit == "Cubic Meters":
-                result = value / 1000
-            elif to_unit == "Gallons":
-                result = value * 0.264172
-            else:
-                result = value
-        elif from_unit == "Milliliters":
-            if to_unit == "Liters":
-                result = value / 1000
-            elif to_unit == "Cubic Meters":
-                result = value / 1000000
-            elif to_unit == "Gallons":
-                result = value * 0.000264172
-            else:
-                result = value
-        elif from_unit == "Cubic Meters":
-            if to_unit == "Liters":
-                result = value * 1000
-            elif to_unit == "Milliliters":
-                result = value * 1000000
-            elif to_unit == "Gallons":
-                result = value * 264.172
-            else:
-                result = value
-        elif from_unit == "Gallons":
-            if to_unit == "Liters":
-                result = value / 0.264172
-            elif to_unit == "Milliliters":
-                result = value / 0.000264172
-            elif to_unit == "Cubic Meters":
-                result = value / 264.172
-            else:
-                result = value
+    if result is None:  # Not already converted from the voice input
+        result = convert(unit_category, from_unit, to_unit, value)
 
     if result is not None and value > 0:  # Check if result is valid and value is positive
         st.success(f"Result: {result} {to_unit}")
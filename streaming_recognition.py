@@ -0,0 +1,171 @@
+import argparse
+import asyncio
+import json
+import time
+from collections import namedtuple
+from contextlib import aclosing
+
+import numpy as np
+
+from audio_service import BLOCK_SIZE, SAMPLE_RATE, AudioService, SimulatedBackend
+from converter import convert, normalize_unit, parse_value
+
+# A recognizer hypothesis plus whatever the speculative interpreter made of it
+Hypothesis = namedtuple("Hypothesis", ["text", "final", "interpreted"])
+
+
+# Runs interpret() once per distinct hypothesis so the answer for the final
+# text is usually already computed from one of the partials
+class Speculator:
+    def __init__(self, interpret):
+        self.interpret = interpret
+        self.results = {}
+
+    def __call__(self, text):
+        if text not in self.results:
+            self.results[text] = self.interpret(text)
+        return self.results[text]
+
+
+# Function to load an offline Vosk model (optional dependency)
+def load_model(model_path):
+    try:
+        from vosk import Model, SetLogLevel
+    except ImportError:
+        raise RuntimeError("Streaming recognition needs the 'vosk' package: pip install vosk")
+    SetLogLevel(-1)
+    return Model(model_path)
+
+
+# Incremental offline decoder: feeds frames to Vosk as they arrive, emits
+# partial hypotheses and stops listening as soon as Vosk detects end of speech
+class StreamingRecognizer:
+    def __init__(self, model, samplerate=SAMPLE_RATE):
+        self.model = model
+        self.samplerate = samplerate
+
+    def _recognizer(self):
+        from vosk import KaldiRecognizer
+
+        return KaldiRecognizer(self.model, self.samplerate)
+
+    async def hypotheses(self, frames, interpret=None):
+        recognizer = self._recognizer()
+        speculate = Speculator(interpret) if interpret is not None else None
+        loop = asyncio.get_running_loop()
+        last_partial = ""
+
+        def hypothesis(text, final):
+            return Hypothesis(text, final, speculate(text) if speculate and text else None)
+
+        # Closing the frames early releases the microphone for other sessions
+        async with aclosing(frames):
+            async for frame in frames:
+                # Decoding is CPU-bound, keep it off the audio service's event loop
+                ended = await loop.run_in_executor(None, recognizer.AcceptWaveform, frame.tobytes())
+                if ended:
+                    text = json.loads(recognizer.Result()).get("text", "")
+                    if text:
+                        yield hypothesis(text, True)
+                        return
+                    last_partial = ""  # Only noise so far, keep listening
+                    continue
+                partial = json.loads(recognizer.PartialResult()).get("partial", "")
+                if partial and partial != last_partial:
+                    last_partial = partial
+                    yield hypothesis(partial, False)
+        # Capture window ran out before an endpoint, take what we have
+        yield hypothesis(json.loads(recognizer.FinalResult()).get("text", ""), True)
+
+    # Decode a whole clip in one go (the batch path, for comparison)
+    def recognize_clip(self, samples):
+        recognizer = self._recognizer()
+        recognizer.AcceptWaveform(samples.astype(np.int16).tobytes())
+        return json.loads(recognizer.FinalResult()).get("text", "")
+
+
+# Function to find where speech ends in a recording (last loud block)
+def find_speech_end(samples, samplerate=SAMPLE_RATE, blocksize=BLOCK_SIZE, threshold=1.4):
+    blocks = len(samples) // blocksize
+    energy = np.abs(samples[:blocks * blocksize].astype(np.float64)).reshape(blocks, blocksize).mean(axis=1)
+    loud = np.nonzero(energy > threshold * np.median(energy))[0]
+    if len(loud) == 0:
+        return 0.0
+    return float((loud[-1] + 1) * blocksize / samplerate)
+
+
+# Benchmark interpreter: a number is converted (metres to feet), anything else is read as a unit
+def _interpret(text):
+    value = parse_value(text)
+    if value is not None:
+        return convert("Length", "Meters", "Feet", value)
+    return normalize_unit(text)
+
+
+async def _batch_run(recognizer, samples, duration, speed):
+    service = AudioService(SimulatedBackend(speed=speed, samples=samples))
+    start = time.perf_counter()
+    recording = await service.record("bench", duration, recognizer.samplerate)
+    loop = asyncio.get_running_loop()
+    text = await loop.run_in_executor(None, recognizer.recognize_clip, recording[:, 0])
+    _interpret(text)
+    return text, time.perf_counter() - start
+
+
+async def _streaming_run(recognizer, samples, duration, speed):
+    service = AudioService(SimulatedBackend(speed=speed, samples=samples))
+    start = time.perf_counter()
+    final = None
+    partials = 0
+    frames = service.capture("bench", duration, recognizer.samplerate)
+    async for hypothesis in recognizer.hypotheses(frames, _interpret):
+        if hypothesis.final:
+            final = hypothesis
+        else:
+            partials += 1
+    return final.text, time.perf_counter() - start, partials
+
+
+def benchmark(model_path, fixture, duration=5.0, speed=1.0, runs=3):
+    from scipy.io.wavfile import read
+
+    if runs < 1:
+        raise ValueError("runs must be at least 1")
+    samplerate, samples = read(fixture)
+    if samples.ndim > 1:
+        samples = samples.mean(axis=1).astype(np.int16)  # Mono, like the live capture
+    recognizer = StreamingRecognizer(load_model(model_path), samplerate)
+    # Wall-clock moment (relative to capture start) when the speaker stopped talking
+    speech_end = find_speech_end(samples, samplerate) / speed
+
+    batch, streaming = [], []
+    for _ in range(runs):
+        text, elapsed = asyncio.run(_batch_run(recognizer, samples, duration, speed))
+        batch.append(elapsed - speech_end)
+        stream_text, elapsed, partials = asyncio.run(_streaming_run(recognizer, samples, duration, speed))
+        streaming.append(elapsed - speech_end)
+    return {
+        "speech_end": speech_end,
+        "batch_text": text,
+        "streaming_text": stream_text,
+        "partials": partials,
+        "batch_latency": min(batch),
+        "streaming_latency": min(streaming),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="End-of-speech-to-result latency: streaming vs batch recognition")
+    parser.add_argument("--model", default="model", help="Path to an unpacked Vosk model")
+    parser.add_argument("--fixture", default="fixtures/voice_command.wav")
+    parser.add_argument("--duration", type=float, default=5.0, help="Capture window in seconds")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed-up over real time")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    stats = benchmark(args.model, args.fixture, args.duration, args.speed, args.runs)
+    print(f"model={args.model} fixture={args.fixture} speed={args.speed} runs={args.runs}")
+    print(f"speech ends at {stats['speech_end']:.2f}s into the capture window")
+    print(f"batch:     {stats['batch_latency']:.3f}s  text={stats['batch_text']!r}")
+    print(f"streaming: {stats['streaming_latency']:.3f}s  text={stats['streaming_text']!r} "
+          f"({stats['partials']} partials)")
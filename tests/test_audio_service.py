@@ -0,0 +1,87 @@
+import asyncio
+from contextlib import aclosing
+
+import pytest
+
+from audio_service import AudioService, FairTurnQueue, SimulatedBackend
+
+SPEED = 1000.0  # Simulated devices run far faster than real time
+
+
+def test_sessions_alternate_when_one_queues_several_turns():
+    async def scenario():
+        service = AudioService(SimulatedBackend(speed=SPEED))
+        order = []
+        turns = [service.record(session, 0.1, on_acquired=lambda session=session: order.append(session))
+                 for session in ["A", "A", "A", "B", "B", "B"]]
+        await asyncio.gather(*turns)
+        return order
+
+    assert asyncio.run(scenario()) == ["A", "B", "A", "B", "A", "B"]
+
+
+def test_waiter_cancelled_after_grant_passes_turn_on():
+    async def scenario():
+        queue = FairTurnQueue()
+        await queue.acquire("A")
+        waiter_b = asyncio.create_task(queue.acquire("B"))
+        waiter_c = asyncio.create_task(queue.acquire("C"))
+        await asyncio.sleep(0)  # Let both start waiting
+
+        queue.release()  # Grants B's turn...
+        waiter_b.cancel()  # ...but B gives up before it gets to run
+        await asyncio.wait_for(waiter_c, timeout=1)
+        return waiter_b.cancelled()
+
+    assert asyncio.run(scenario())
+
+
+def test_breaking_out_of_capture_releases_the_mic():
+    async def scenario():
+        service = AudioService(SimulatedBackend(speed=SPEED))
+        async with aclosing(service.capture("A", 5.0)) as frames:
+            async for _frame in frames:
+                break
+        recording = await asyncio.wait_for(service.record("B", 0.1), timeout=1)
+        return len(recording)
+
+    assert asyncio.run(scenario()) == 4410
+
+
+def test_playback_waits_for_capture():
+    async def scenario():
+        service = AudioService(SimulatedBackend(speed=SPEED))
+        events = []
+
+        async def listen():
+            async for _frame in service.capture("A", 1.0, on_acquired=lambda: events.append("capture")):
+                pass
+            events.append("capture done")
+
+        async def prompt():
+            await asyncio.sleep(0)  # Ask for the speakers while A is recording
+            await service.play("B", "Which unit do you want to convert from?")
+            events.append("played")
+
+        await asyncio.gather(listen(), prompt())
+        return events
+
+    assert asyncio.run(scenario()) == ["capture", "capture done", "played"]
+
+
+def test_iterate_releases_the_mic_when_the_caller_bails_out():
+    class Rerun(Exception):
+        pass  # Stands in for a Streamlit rerun raised from st.* while waiting
+
+    def waiting(pending):
+        raise Rerun
+
+    service = AudioService(SimulatedBackend(speed=1.0)).start()  # Slow enough to still be mid-step
+    try:
+        with pytest.raises(Rerun):
+            for _frame in service.iterate(service.capture("A", 5.0), waiting=waiting):
+                pass
+        recording = service.submit(service.record("B", 0.1)).result(timeout=1)
+        assert len(recording) == 4410
+    finally:
+        service.stop()
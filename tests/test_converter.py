@@ -0,0 +1,62 @@
+import pytest
+
+from converter import convert, parse_category, parse_unit, parse_value
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("12", 12.0),
+    ("2.5", 2.5),
+    ("twelve", 12.0),
+    ("zero", 0.0),
+    ("twenty five", 25.0),
+    ("twenty-five", 25.0),
+    ("one hundred", 100.0),
+    ("one hundred and five", 105.0),
+    ("three hundred forty two", 342.0),
+    ("two thousand", 2000.0),
+    ("two thousand five hundred", 2500.0),
+    ("three point one four", 3.14),
+    ("one two five", 125.0),  # Digit by digit
+    ("one two three", 123.0),
+    ("fifteen hundred", 1500.0),
+    ("fifteen hundred and five", 1505.0),
+    ("a hundred", 100.0),
+    ("a thousand", 1000.0),
+    ("a hundred and twenty", 120.0),
+    ("point five", 0.5),
+])
+def test_parse_value_reads_numbers(text, expected):
+    assert parse_value(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    None,
+    "",
+    "meters",
+    "hundred",
+    "hundred hundred",
+    "five twenty",
+    "twenty twenty",
+    "twenty zero",
+    "   ",
+    "a",
+    "a five",
+    "hundred and five",
+    "point",
+    "one two twenty",
+    "three point twelve",
+    "one point two point three",
+])
+def test_parse_value_rejects_other_word_orders(text):
+    assert parse_value(text) is None
+
+
+def test_convert_spoken_value():
+    assert convert("Length", "Kilometers", "Meters", parse_value("twenty five")) == 25000
+
+
+def test_parse_category_and_unit():
+    assert parse_category("length") == "Length"
+    assert parse_category("speed") is None
+    assert parse_unit("kilometre", ["Meters", "Kilometers"]) == "Kilometers"
+    assert parse_unit("pound", ["Meters", "Kilometers"]) is None
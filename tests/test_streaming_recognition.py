@@ -0,0 +1,96 @@
+import asyncio
+import json
+
+from audio_service import AudioService, SimulatedBackend
+from streaming_recognition import StreamingRecognizer
+
+SPEED = 1000.0  # Simulated devices run far faster than real time
+
+
+# Stands in for vosk.KaldiRecognizer: steps[i] is what the i-th AcceptWaveform
+# call hears, either a partial hypothesis or ("end", text) for an endpoint
+class FakeKaldiRecognizer:
+    def __init__(self, steps, final_text=""):
+        self.steps = steps
+        self.final_text = final_text
+        self.frames = 0
+        self.partial = ""
+        self.text = ""
+
+    def AcceptWaveform(self, data):
+        step = self.steps[self.frames] if self.frames < len(self.steps) else self.partial
+        self.frames += 1
+        if isinstance(step, tuple):
+            self.text = step[1]
+            self.partial = ""
+            return True
+        self.partial = step
+        return False
+
+    def PartialResult(self):
+        return json.dumps({"partial": self.partial})
+
+    def Result(self):
+        return json.dumps({"text": self.text})
+
+    def FinalResult(self):
+        return json.dumps({"text": self.final_text})
+
+
+class FakeStreamingRecognizer(StreamingRecognizer):
+    def __init__(self, fake):
+        super().__init__(model=None)
+        self.fake = fake
+
+    def _recognizer(self):
+        return self.fake
+
+
+def run_hypotheses(fake, duration=5.0, interpret=None):
+    async def scenario():
+        service = AudioService(SimulatedBackend(speed=SPEED))
+        recognizer = FakeStreamingRecognizer(fake)
+        hypotheses = [h async for h in recognizer.hypotheses(service.capture("A", duration), interpret)]
+        # The mic must be free for the next session straight away
+        recording = await asyncio.wait_for(service.record("B", 0.1), timeout=1)
+        return hypotheses, len(recording)
+
+    return asyncio.run(scenario())
+
+
+def test_endpoint_ends_capture_early_and_frees_the_mic():
+    fake = FakeKaldiRecognizer(["", "twelve", ("end", "twelve")])
+    hypotheses, recorded = run_hypotheses(fake, duration=5.0)
+
+    assert fake.frames == 3  # Out of 50 frames in the 5 second window
+    assert hypotheses[-1].text == "twelve" and hypotheses[-1].final
+    assert recorded == 4410
+
+
+def test_repeated_partials_are_emitted_once():
+    fake = FakeKaldiRecognizer(["two", "two", "twenty", "twenty", "twenty five", ("end", "twenty five")])
+    hypotheses, _ = run_hypotheses(fake)
+
+    assert [h.text for h in hypotheses if not h.final] == ["two", "twenty", "twenty five"]
+
+
+def test_interpret_runs_once_per_text_and_final_reuses_it():
+    calls = []
+
+    def interpret(text):
+        calls.append(text)
+        return f"parsed {text}"
+
+    fake = FakeKaldiRecognizer(["two", "twenty", "twenty five", ("end", "twenty five")])
+    hypotheses, _ = run_hypotheses(fake, interpret=interpret)
+
+    assert calls == ["two", "twenty", "twenty five"]
+    assert hypotheses[-1].final and hypotheses[-1].interpreted == "parsed twenty five"
+
+
+def test_final_result_is_used_when_the_window_runs_out():
+    fake = FakeKaldiRecognizer(["twelve"], final_text="twelve")
+    hypotheses, _ = run_hypotheses(fake, duration=0.3)
+
+    assert fake.frames == 3
+    assert [(h.text, h.final) for h in hypotheses] == [("twelve", False), ("twelve", True)]